@@ -1,6 +1,8 @@
 """Utility functions for the camera model.
 """
 
+import typing as T
+
 import numpy as np
 
 from src.data_model import Camera
@@ -15,10 +17,81 @@ def compute_focal_length_in_mm(camera: Camera) -> np.ndarray:
     Returns:
         [fx, fy] in mm as a 2-element array.
     """
-    pixel_to_mm_x = camera.sensor_size_x_mm / camera.image_size_x_px
-    pixel_to_mm_y = camera.sensor_size_y_mm / camera.image_size_y_px
+    return camera.focal_length_mm.copy() #the cached array is shared and read-only
+
+
+def project_world_points_to_image(camera: Camera, world_points: np.ndarray) -> np.ndarray:
+    """Project a batch of 3D world points into the image coordinates.
+
+    Args:
+        camera: the camera model
+        world_points: the 3D world points as an (N, 3) array, or a single 3-element point
+
+    Returns:
+        (N, 2) array of [u, v] pixel coordinates, or a 2-element array for a single point.
+    """
+    world_points = np.asarray(world_points)
+    is_single = world_points.ndim == 1
+    if is_single:
+        world_points = world_points.reshape(1, 3)
+
+    vecs = world_points @ camera.K.T #all projections in one matmul, cx/cy in K are the intrinsic offset of camera placement
+    pixel_coords = vecs[:, :2] / vecs[:, 2:3]
+
+    return pixel_coords[0] if is_single else pixel_coords
+
 
-    return np.array([camera.fx * pixel_to_mm_x, camera.fy * pixel_to_mm_y])
+def project_at_fixed_z(camera: Camera, xy_points: np.ndarray, z: float) -> np.ndarray:
+    """Project world points that all share the same depth into the image coordinates.
+
+    Args:
+        camera: the camera model
+        xy_points: (N, 2) array of [X, Y] world coordinates
+        z: depth shared by all points (e.g. the flight height)
+
+    Returns:
+        (N, 2) array of [u, v] pixel coordinates.
+    """
+    scale = np.array([camera.fx / z, camera.fy / z]) #divide once instead of once per point
+    cxy = np.array([camera.cx, camera.cy])
+
+    return xy_points * scale + cxy
+
+
+def make_projector(camera: Camera) -> T.Callable[..., np.ndarray]:
+    """Build a projection function specialized to a fixed camera.
+
+    Args:
+        camera: the camera model
+
+    Returns:
+        project(world_points, out=None) mapping (N, 3) world points to (N, 2) pixel coordinates.
+        Passing a preallocated (N, 2) out array lets callers reuse it across frames.
+    """
+    fxy = np.array([camera.fx, camera.fy])
+    cxy = np.array([camera.cx, camera.cy])
+
+    def project(world_points: np.ndarray, out: T.Optional[np.ndarray] = None) -> np.ndarray:
+        out = np.multiply(world_points[:, :2], fxy, out=out)
+        np.divide(out, world_points[:, 2:3], out=out) #in place, no temporaries
+        np.add(out, cxy, out=out)
+        return out
+
+    return project
+
+
+def project_batch(K_stack: np.ndarray, world_points: np.ndarray) -> np.ndarray:
+    """Project a batch of 3D world points through several cameras at once.
+
+    Args:
+        K_stack: (B, 3, 3) stack of intrinsics matrices (e.g. camera.K for each camera)
+        world_points: (N, 3) array of 3D world points
+
+    Returns:
+        (B, N, 2) array of [u, v] pixel coordinates, one (N, 2) block per camera.
+    """
+    vecs = np.einsum("bij,nj->bni", K_stack, world_points, optimize=True) #lets einsum pick a BLAS-backed contraction
+    return vecs[..., :2] / vecs[..., 2:3]
 
 
 def project_world_point_to_image(camera: Camera, world_point: np.ndarray) -> np.ndarray:
@@ -31,17 +104,7 @@ def project_world_point_to_image(camera: Camera, world_point: np.ndarray) -> np.
     Returns:
         [u, v] pixel coordinates corresponding to the 3D world point.
     """
-    
-    X = world_point[0]
-    Y = world_point[1]
-    Z = world_point[2]    
-
-    u = camera.fx*(X/Z) + camera.cx #the cx/cy is the intrinsic parameter (offset) of camera placement
-    v = camera.fy*(Y/Z) + camera.cy
-
-    pixel_coords = np.array([u, v])
-    
-    return pixel_coords
+    return project_world_points_to_image(camera, world_point)
 
 
 def compute_image_footprint_on_surface(
@@ -56,16 +119,7 @@ def compute_image_footprint_on_surface(
     Returns:
         [footprint_x, footprint_y] in meters as a 2-element array.
     """
-    focal_length = compute_focal_length_in_mm(camera)
-    focal_length_x = focal_length[0]
-    focal_length_y = focal_length[1]
-
-    footprint_x = distance_from_surface * (camera.sensor_size_x_mm / focal_length_x) #distance_from_surface is like Z, while focal is f
-    footprint_y = distance_from_surface * (camera.sensor_size_y_mm / focal_length_y) 
-
-    footprint = np.array([footprint_x, footprint_y])
-
-    return footprint
+    return distance_from_surface * camera.sensor_size_mm / camera.focal_length_mm #distance_from_surface is like Z, while focal is f
 
 def compute_ground_sampling_distance(
     camera: Camera, distance_from_surface: float
@@ -80,11 +134,5 @@ def compute_ground_sampling_distance(
         The GSD in meters (smaller among x and y directions). You should return a float and not a numpy data type.
     """
     
-    footprint = compute_image_footprint_on_surface(camera, distance_from_surface)
-    footprint_x = footprint[0]
-    footprint_y = footprint[1]
-
-    GSD_x = footprint_x / camera.image_size_x_px
-    GSD_y = footprint_y / camera.image_size_y_px
-
-    return min(GSD_x, GSD_y)
+    #footprint / image size = distance * (sensor_mm / image_px) / (f_px * sensor_mm / image_px), so the pixel-to-mm conversion cancels
+    return float(distance_from_surface * min(1.0 / camera.fx, 1.0 / camera.fy))
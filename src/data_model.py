@@ -1,6 +1,15 @@
+import typing as T
 from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
 """Data models for the camera and user specification."""
 
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """Marks a cached array as read-only so callers cannot corrupt the shared value."""
+    array.setflags(write=False)
+    return array
+
 @dataclass
 class DatasetSpec:
     """
@@ -14,7 +23,7 @@ class DatasetSpec:
     scan_dimension_y: int #vertical size of the rectangle to be scanned (in meters).
     exposure_time_ms: int #exposure time for each image (in milliseconds).
 
-@dataclass
+@dataclass(frozen=True)
 class Camera:
     """
     Data model for a simple pinhole camera.
@@ -33,6 +42,27 @@ class Camera:
     image_size_x_px: int #Number of pixels in the image along the x axis
     image_size_y_px: int #Number of pixels in the image along the y axis
 
+    #Derived quantities are cached on first access; the camera is frozen so they never go stale
+    @cached_property
+    def K(self) -> np.ndarray:
+        """Intrinsics matrix of the camera (3x3)."""
+        return _read_only(np.array([[self.fx, 0, self.cx], [0, self.fy, self.cy], [0, 0, 1]]))
+
+    @cached_property
+    def pixel_to_mm(self) -> np.ndarray:
+        """Size of a single pixel [x, y] in mm."""
+        return _read_only(np.array([self.sensor_size_x_mm / self.image_size_x_px, self.sensor_size_y_mm / self.image_size_y_px]))
+
+    @cached_property
+    def focal_length_mm(self) -> np.ndarray:
+        """Focal lengths [fx, fy] in mm."""
+        return _read_only(np.array([self.fx, self.fy]) * self.pixel_to_mm)
+
+    @cached_property
+    def sensor_size_mm(self) -> np.ndarray:
+        """Sensor size [x, y] in mm."""
+        return _read_only(np.array([self.sensor_size_x_mm, self.sensor_size_y_mm]))
+
 @dataclass
 class Waypoint:
     """
@@ -43,4 +73,66 @@ class Waypoint:
     y: float
     z: float
     speed_mps: float
-    photo_trigger: bool = False
\ No newline at end of file
+    photo_trigger: bool = False
+
+@dataclass(eq=False) #array fields make the generated __eq__ ambiguous, see __eq__ below
+class FlightPlan:
+    """
+    Struct-of-arrays flight plan: one entry per waypoint, in flight order.
+    Positions live in one C-contiguous (N, 3) array so consecutive waypoints are adjacent in memory.
+    Positions and speeds are float32 (cm precision over survey-sized areas is plenty).
+    """
+
+    points: np.ndarray #[x, y, z] positions of the waypoints (in meters), shape (N, 3)
+    speeds_mps: np.ndarray #speed of the drone at each waypoint (in m/s)
+    triggers: np.ndarray #whether a photo is captured at each waypoint
+
+    @property
+    def xs(self) -> np.ndarray:
+        """x positions of the waypoints (view into points)."""
+        return self.points[:, 0]
+
+    @property
+    def ys(self) -> np.ndarray:
+        """y positions of the waypoints (view into points)."""
+        return self.points[:, 1]
+
+    @property
+    def zs(self) -> np.ndarray:
+        """Heights of the waypoints (view into points)."""
+        return self.points[:, 2]
+
+    @classmethod
+    def from_waypoints(cls, waypoints: T.Sequence[Waypoint]) -> "FlightPlan":
+        """Builds a flight plan from a list of Waypoint objects, one typed array per attribute."""
+        count = len(waypoints)
+        points = np.empty((count, 3), dtype=np.float32, order="C")
+        points[:, 0] = np.fromiter((waypoint.x for waypoint in waypoints), dtype=np.float32, count=count)
+        points[:, 1] = np.fromiter((waypoint.y for waypoint in waypoints), dtype=np.float32, count=count)
+        points[:, 2] = np.fromiter((waypoint.z for waypoint in waypoints), dtype=np.float32, count=count)
+        return cls(
+            points = points,
+            speeds_mps = np.fromiter((waypoint.speed_mps for waypoint in waypoints), dtype=np.float32, count=count),
+            triggers = np.fromiter((waypoint.photo_trigger for waypoint in waypoints), dtype=bool, count=count),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        """Plans are equal when every waypoint matches, like the list-of-waypoints form."""
+        if not isinstance(other, FlightPlan):
+            return NotImplemented
+        return (
+            np.array_equal(self.points, other.points)
+            and np.array_equal(self.speeds_mps, other.speeds_mps)
+            and np.array_equal(self.triggers, other.triggers)
+        )
+
+    __hash__ = None #mutable arrays, not hashable
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def __getitem__(self, index: T.Union[int, slice]) -> T.Union[Waypoint, T.List[Waypoint]]:
+        """Builds Waypoint objects on demand for callers that expect the list-of-waypoints form."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return Waypoint(float(self.xs[index]), float(self.ys[index]), float(self.zs[index]), speed_mps = float(self.speeds_mps[index]), photo_trigger = bool(self.triggers[index]))
@@ -1,9 +1,21 @@
 import typing as T
 import math
+from dataclasses import dataclass
 
 import numpy as np
 
-from src.data_model import Camera, DatasetSpec, Waypoint
+try:
+    from numba import njit, prange
+    _HAS_NUMBA = True
+except ImportError: #numba is optional, waypoint_times falls back to the NumPy path without it
+    _HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+    prange = range
+
+from src.data_model import Camera, DatasetSpec, FlightPlan
 from src.camera_utils import (
     compute_image_footprint_on_surface,
     compute_ground_sampling_distance,
@@ -49,89 +61,183 @@ def compute_speed_during_photo_capture(
     return drone_speed_mps
 
 
+def _axis_centers(scan_dim: float, dist_between_img: float) -> np.ndarray:
+    """Compute the image centers along one axis of the scan, centered inside the scan boundary.
+
+    Args:
+        scan_dim: size of the scan along the axis (in meters).
+        dist_between_img: maximum distance between consecutive images along the axis (in meters).
+
+    Returns:
+        Positions of the image centers along the axis (float32).
+    """
+    if not dist_between_img > 0:
+        raise ValueError(f"Distance between images must be positive, got {dist_between_img} (overlap/sidelap of 1 leaves no spacing)")
+
+    num_points = max(1, math.ceil(scan_dim / dist_between_img)) #ceiling rounds up
+    if num_points == 1: #if there's only 1 point available, center it to minimize waste
+        return np.array([scan_dim / 2], dtype=np.float32)
+
+    cent_dist = min(dist_between_img, scan_dim / (num_points - 1))
+    offset = 0.5 * (scan_dim - cent_dist * (num_points - 1)) #offset so images are centered inside scan boundary
+    return (offset + np.arange(num_points) * cent_dist).astype(np.float32) #plan coordinates are single precision
+
+
 def generate_photo_plan_on_grid(
     camera: Camera, dataset_spec: DatasetSpec
-) -> T.List[Waypoint]:
-    """Generate the complete photo plan as a list of waypoints in a lawn-mower pattern.
+) -> FlightPlan:
+    """Generate the complete photo plan as a flight plan of waypoints in a lawn-mower pattern.
 
     Args:
         camera: Camera model used for image capture.
         dataset_spec: user specification for the dataset.
 
     Returns:
-        Scan plan as a list of waypoints.
+        Scan plan as a FlightPlan (one array entry per waypoint).
 
     """
     
     drone_velocity = compute_speed_during_photo_capture(camera, dataset_spec, allowed_movement_px=1)
 
     dist_between_img_x, dist_between_img_y = compute_distance_between_images(camera, dataset_spec)
-    num_point_x = math.ceil(dataset_spec.scan_dimension_x / dist_between_img_x) #ceiling rounds up
-    num_point_y = math.ceil(dataset_spec.scan_dimension_y / dist_between_img_y)
-    gaps_x = num_point_x - 1
-    gaps_y = num_point_y - 1
+    centers_x = _axis_centers(dataset_spec.scan_dimension_x, dist_between_img_x)
+    centers_y = _axis_centers(dataset_spec.scan_dimension_y, dist_between_img_y)
+    num_point_x = centers_x.size
+    num_point_y = centers_y.size
+
+    num_points = num_point_x * num_point_y #known up front, so points is allocated once
+    points = np.empty((num_points, 3), dtype=np.float32, order="C") #contiguous so downstream sweeps walk memory linearly
+    grid_x = points[:, 0].reshape(num_point_y, num_point_x) #views into points, one row per y center
+    grid_y = points[:, 1].reshape(num_point_y, num_point_x)
+
+    idx = np.arange(num_point_x)
+    flip = np.arange(num_point_y) % 2 == 1 #every other row is flown in reverse when going up to next row
+    cols = np.where(flip[:, None], idx[::-1], idx)
+    grid_x[...] = centers_x[cols] #one gather for every row, copied into the strided x column
+    grid_y[...] = centers_y[:, None] #broadcast, no repeated copy of the y centers
+    points[:, 2] = dataset_spec.height
+
+    flight_plan = FlightPlan(
+        points = points,
+        speeds_mps = np.full(num_points, drone_velocity, dtype=np.float32),
+        triggers = np.ones(num_points, dtype=bool),
+    )
 
-    centers_x = []
-    centers_y = []
+    return flight_plan
 
-    if num_point_x == 1: #if there's only 1 point available
-        offset_x = dataset_spec.scan_dimension_x / 2
-        centers_x = [offset_x] #offset so image is centered inside scan boundary, minimizing waste
+def waypoint_times(plan, acc, v_max):
+    """Applies trapezoidal and calculates the time between each waypoint
 
-    else:
-        cent_dist_x = min(dist_between_img_x, dataset_spec.scan_dimension_x / gaps_x)
-        offset_x = 0.5 * (dataset_spec.scan_dimension_x - cent_dist_x * gaps_x) 
-        for index in range(num_point_x):
-            centers_x.append(offset_x + index * cent_dist_x) #adding edge offset + iterating for each center
+    Args:
+        plan: flight plan (or list of waypoints) whose waypoint positions and speeds are used
+        acc: acceleration of drone
+        v_max: maximum drone speed
 
-    if num_point_y == 1:
-        offset_y = dataset_spec.scan_dimension_y / 2
-        centers_y = [offset_y]
+    Returns:
+        Array with the cumulative time at each waypoint after trapezoidal profiling is applied
+
+    """
+    if not isinstance(plan, FlightPlan): #legacy list of waypoints
+        plan = FlightPlan.from_waypoints(plan)
 
+    if _HAS_NUMBA:
+        trap_times = _segment_times(plan.points, plan.speeds_mps, acc, v_max)
     else:
-        cent_dist_y = min(dist_between_img_y, dataset_spec.scan_dimension_y / gaps_y)
-        offset_y = 0.5 * (dataset_spec.scan_dimension_y - cent_dist_y * gaps_y)
-        for index in range(num_point_y):
-            centers_y.append(offset_y + index * cent_dist_y) 
-
-    flight_plan = []
-    z = dataset_spec.height
-    for index, y in enumerate(centers_y): #enum to help iterate through y coords
-        if index % 2 == 0:
-            x_vals = centers_x
-        else:
-            x_vals = centers_x[::-1] #makes a copy, and then reverses when going up to next row
-        for x in x_vals:
-            flight_plan.append(Waypoint(x, y, z, speed_mps = drone_velocity, photo_trigger = True))
+        diffs = np.diff(plan.points[:, :2], axis=0) #streams the contiguous (N, 3) positions
+        np.multiply(diffs, diffs, out=diffs)
+        dists = np.sqrt(diffs.sum(axis=1)) #all segment lengths at once, hypot's overflow scaling is not needed at drone scale
+        v_blur = plan.speeds_mps[:-1]
+        if v_blur.size and np.all(v_blur == v_blur[0]): #common case: one capture speed for the whole plan, so the profile constants are computed once
+            v_blur = float(v_blur[0])
+        trap_times = make_trapezoidal(acc, v_blur, v_max).segment_time(dists)
 
-    return flight_plan
+    return np.concatenate(([0.0], np.cumsum(trap_times, dtype=np.float64))) #accumulate absolute time in double precision
 
-def waypoint_times(plan, acc, v_max):
-    """Applies trapezoidal and calculates the time between each waypoint
+@njit(parallel=True, fastmath=True, cache=True)
+def _segment_times(points, speeds, acc, v_max):
+    """Compiled per-segment times behind waypoint_times (same math as apply_trapezoidal_prof).
+
+    Segments are independent, so they are spread across threads; the running sum is left to the caller.
+    """
+    num_segments = max(points.shape[0] - 1, 0) #empty plan has no segments
+    dt = np.empty(num_segments, dtype=np.float64)
+    inv_v_max = 1 / v_max
+    inv_acc = 1 / acc
+
+    for inc in prange(num_segments):
+        dx = points[inc + 1, 0] - points[inc, 0]
+        dy = points[inc + 1, 1] - points[inc, 1]
+        dist = math.sqrt(dx * dx + dy * dy)
+        v_blur = speeds[inc]
+
+        d_thresh = (v_max**2 - v_blur**2) * inv_acc
+        if dist >= d_thresh: #if a trapezoid
+            dt[inc] = 2 * (v_max - v_blur) * inv_acc + (dist - d_thresh) * inv_v_max
+        else: #if a triangle
+            dt[inc] = 2 * (math.sqrt(v_blur**2 + acc * dist) - v_blur) * inv_acc
+    return dt
+
+@dataclass(frozen=True, eq=False) #fields may be per-segment arrays, so profiles compare and hash by identity
+class TrapezoidalProfile:
+    """
+    Constants of the trapezoidal profile that only depend on (acc, v_blur, v_max), so they
+    can be computed once and reused for every segment.
+    """
+
+    acc: float #acceleration of drone
+    v_blur: T.Union[float, np.ndarray] #drone velocity for acceptable blur (scalar or one per segment)
+    d_thresh: T.Union[float, np.ndarray] #distance needed to accelerate to v_max and back down, trapezoid at or above it
+    t_acc: T.Union[float, np.ndarray] #time to accelerate from v_blur to v_max
+    inv_v_max: float #1 / v_max
+    inv_acc: float #1 / acc
+
+    def segment_time(self, dist):
+        """Time to cover a distance (scalar or array), trapezoid if v_max is reached, triangle otherwise."""
+        if np.ndim(dist) == 0 and np.ndim(self.v_blur) == 0: #single segment: one compare picks the branch
+            if dist >= self.d_thresh:
+                return 2 * self.t_acc + (dist - self.d_thresh) * self.inv_v_max
+            return 2 * (math.sqrt(self.v_blur**2 + self.acc * dist) - self.v_blur) * self.inv_acc
+
+        t_trap = 2 * self.t_acc + (dist - self.d_thresh) * self.inv_v_max
+        t_tri = 2 * (np.sqrt(self.v_blur**2 + self.acc * dist) - self.v_blur) * self.inv_acc
+
+        return np.where(dist >= self.d_thresh, t_trap, t_tri)
+
+def make_trapezoidal(acc, v_blur, v_max):
+    """Precomputes the segment-invariant constants of the trapezoidal profile
 
     Args:
-        plan: reads waypoints, used to iterate through each point for data
         acc: acceleration of drone
+        v_blur: calculated drone velocity for acceptable blur (scalar or one per segment)
         v_max: maximum drone speed
 
     Returns:
-        Time between each waypoint after trapezoidal profiling is applied
+        TrapezoidalProfile whose segment_time only does the per-distance work
 
     """
-    times = [0.0]
-    time_total = 0.0
-    
-    for inc in range(len(plan) - 1):
-        dist_x = plan[inc + 1].x - plan[inc].x
-        dist_y = plan[inc + 1].y - plan[inc].y
-        dist = math.hypot(dist_x, dist_y)
-    
-        v_blur = plan[inc].speed_mps
-        trap_time, _, _, _ = apply_trapezoidal_prof(dist, acc, v_blur, v_max)
-        time_total += trap_time
+    return TrapezoidalProfile(
+        acc = acc,
+        v_blur = v_blur,
+        d_thresh = (v_max**2 - v_blur**2) / acc,
+        t_acc = (v_max - v_blur) / acc,
+        inv_v_max = 1 / v_max,
+        inv_acc = 1 / acc,
+    )
+
+def apply_trapezoidal_prof_batched(dist, acc, v_blur, v_max):
+    """Calculates the trapezoidal profiling time for many segments at once
 
-        times.append(time_total)
-    return times
+    Args:
+        dist: array of distances, one per segment
+        acc: acceleration of drone
+        v_blur: calculated drone velocity for acceptable blur (scalar or one per segment)
+        v_max: maximum drone speed
+
+    Returns:
+        Array of times to cover each segment after trapezoidal profiling is applied
+
+    """
+    return make_trapezoidal(acc, v_blur, v_max).segment_time(dist)
 
 def apply_trapezoidal_prof(dist, acc, v_blur, v_max):
     """Calculates the trapezoidal profiling for the drone based on 4 inputs
@@ -143,13 +249,18 @@ def apply_trapezoidal_prof(dist, acc, v_blur, v_max):
         v_max: maximum drone speed
 
     Returns:
-        Time between each waypoint after trapezoidal profiling is applied
+        Time between each waypoint after trapezoidal profiling is applied, with the
+        profile times, velocities and shape. If dist is an array, only the array of
+        segment times is returned (see apply_trapezoidal_prof_batched).
 
     """
-    s_acc = (v_max**2 - v_blur**2) / (2 * acc)
-    if 2 * s_acc <= dist: #if a trapezoid
+    if isinstance(dist, np.ndarray):
+        return apply_trapezoidal_prof_batched(dist, acc, v_blur, v_max)
+
+    d_thresh = (v_max**2 - v_blur**2) / acc #distance to accelerate to v_max and back down
+    if dist >= d_thresh: #if a trapezoid
         t_acc = (v_max - v_blur) / acc
-        t_cruise = (dist - 2 * s_acc) / v_max
+        t_cruise = (dist - d_thresh) / v_max
         t_total = 2 * t_acc + t_cruise
 
         times = [0.0, t_acc, t_acc + t_cruise, t_total]
@@ -1,5 +1,5 @@
 import unittest
-from copy import deepcopy
+from dataclasses import replace
 
 import numpy as np
 
@@ -24,22 +24,76 @@ class CameraUnitsTest(unittest.TestCase):
         np.testing.assert_allclose(computed_projection, expected_projection[::-1])
 
         # Case 3: Shift principal point to the bottom left
-        camera_ = deepcopy(TEST_CAMERA)
-        camera_.cx = camera_.image_size_x_px // 4
-        camera_.cy = camera_.image_size_y_px * 3 // 4
+        camera_ = replace(TEST_CAMERA, cx=TEST_CAMERA.image_size_x_px // 4, cy=TEST_CAMERA.image_size_y_px * 3 // 4)
 
         expected_projection = np.array([390.0, 1030.0])
         computed_projection = camera_utils.project_world_point_to_image(camera_, world_point)
         np.testing.assert_allclose(computed_projection, expected_projection)
 
         # Make two focal lengths different
-        camera_ = deepcopy(TEST_CAMERA)
-        camera_.fy = 0.75 * camera_.fx
+        camera_ = replace(TEST_CAMERA, fy=0.75 * TEST_CAMERA.fx)
 
         expected_projection = np.array([640.0, 710.0])
         computed_projection = camera_utils.project_world_point_to_image(camera_, world_point)
         np.testing.assert_allclose(computed_projection, expected_projection)
 
+    def test_project_world_points_to_image(self) -> None:
+
+        # Case 1: batch of points
+        world_points = np.array([[10.0, 20.0, 50.0], [20.0, 10.0, 50.0], [-5.0, 7.5, 25.0]])
+        expected_projection = np.array([[640.0, 780.0], [780.0, 640.0], [360.0, 710.0]])
+        computed_projection = camera_utils.project_world_points_to_image(TEST_CAMERA, world_points)
+        self.assertEqual(computed_projection.shape, (3, 2))
+        np.testing.assert_allclose(computed_projection, expected_projection)
+
+        # Case 2: a single point keeps the 2-element output
+        computed_projection = camera_utils.project_world_points_to_image(TEST_CAMERA, world_points[0])
+        self.assertEqual(computed_projection.shape, (2,))
+        np.testing.assert_allclose(computed_projection, np.array([640.0, 780.0]))
+
+    def test_project_batch(self) -> None:
+
+        # Each camera's block matches projecting with that camera alone
+        world_points = np.array([[10.0, 20.0, 50.0], [20.0, 10.0, 50.0], [-5.0, 7.5, 25.0]])
+        cameras = [TEST_CAMERA, replace(TEST_CAMERA, fy=0.75 * TEST_CAMERA.fx), replace(TEST_CAMERA, cx=250, cy=750)]
+        K_stack = np.stack([camera.K for camera in cameras])
+        computed_projection = camera_utils.project_batch(K_stack, world_points)
+        self.assertEqual(computed_projection.shape, (3, 3, 2))
+        for camera, projection in zip(cameras, computed_projection):
+            np.testing.assert_allclose(projection, camera_utils.project_world_points_to_image(camera, world_points))
+
+    def test_project_at_fixed_z(self) -> None:
+
+        # Matches the general projection when every point is at the same depth
+        xy_points = np.array([[10.0, 20.0], [20.0, 10.0], [-5.0, 7.5]])
+        world_points = np.column_stack([xy_points, np.full(3, 50.0)])
+        expected_projection = camera_utils.project_world_points_to_image(TEST_CAMERA, world_points)
+        computed_projection = camera_utils.project_at_fixed_z(TEST_CAMERA, xy_points, 50.0)
+        np.testing.assert_allclose(computed_projection, expected_projection)
+
+    def test_make_projector(self) -> None:
+
+        world_points = np.array([[10.0, 20.0, 50.0], [20.0, 10.0, 50.0], [-5.0, 7.5, 25.0]])
+        expected_projection = camera_utils.project_world_points_to_image(TEST_CAMERA, world_points)
+        project = camera_utils.make_projector(TEST_CAMERA)
+
+        # Case 1: projector allocates its output
+        np.testing.assert_allclose(project(world_points), expected_projection)
+
+        # Case 2: preallocated output is filled and returned
+        out = np.empty((3, 2))
+        computed_projection = project(world_points, out=out)
+        self.assertIs(computed_projection, out)
+        np.testing.assert_allclose(out, expected_projection)
+
+    def test_compute_focal_length_in_mm(self) -> None:
+
+        # Returned array is the caller's own, mutating it does not touch the camera's cached value
+        focal_length = camera_utils.compute_focal_length_in_mm(TEST_CAMERA)
+        np.testing.assert_allclose(focal_length, np.array([7.0, 7.0]))
+        focal_length *= 2
+        np.testing.assert_allclose(camera_utils.compute_focal_length_in_mm(TEST_CAMERA), np.array([7.0, 7.0]))
+
     def test_compute_image_footprint_on_surface(self) -> None:
 
         # Case 1: baseline
@@ -53,27 +107,25 @@ class CameraUnitsTest(unittest.TestCase):
         expected_footprint = np.array([428.57, 428.57])
         computed_footprint = camera_utils.compute_image_footprint_on_surface(TEST_CAMERA, height)
         np.testing.assert_allclose(computed_footprint, expected_footprint, rtol=1e-3, atol=1e-1)
+        computed_footprint *= 0.5 #result is the caller's own array
+        np.testing.assert_allclose(camera_utils.compute_image_footprint_on_surface(TEST_CAMERA, height), expected_footprint, rtol=1e-3, atol=1e-1)
 
         # Case 3: reduce focal lengths
-        camera_ = deepcopy(TEST_CAMERA)
-        camera_.fx = camera_.fx * 0.5
-        camera_.fy = camera_.fy * 0.75
+        camera_ = replace(TEST_CAMERA, fx=TEST_CAMERA.fx * 0.5, fy=TEST_CAMERA.fy * 0.75)
         height = 150
         expected_footprint = np.array([428.57, 285.71])
         computed_footprint = camera_utils.compute_image_footprint_on_surface(camera_, height)
         np.testing.assert_allclose(computed_footprint, expected_footprint, rtol=1e-3, atol=1e-1)
 
         # Case 4: increase number of pixels (this changes the focal length in mm)
-        camera_ = deepcopy(TEST_CAMERA)
-        camera_.image_size_x_px = camera_.image_size_x_px // 2
+        camera_ = replace(TEST_CAMERA, image_size_x_px=TEST_CAMERA.image_size_x_px // 2)
         height = 150
         expected_footprint = np.array([107.14, 214.29])
         computed_footprint = camera_utils.compute_image_footprint_on_surface(camera_, height)
         np.testing.assert_allclose(computed_footprint, expected_footprint, rtol=1e-1, atol=1e-1)
 
         # Case 5: increase sensor width (this changes focal length in mm proportionately)
-        camera_ = deepcopy(TEST_CAMERA)
-        camera_.sensor_size_y_mm = camera_.sensor_size_y_mm * 1.25
+        camera_ = replace(TEST_CAMERA, sensor_size_y_mm=TEST_CAMERA.sensor_size_y_mm * 1.25)
         height = 150
         expected_footprint = np.array([214.29, 214.29])
         computed_footprint = camera_utils.compute_image_footprint_on_surface(TEST_CAMERA, height)
@@ -87,8 +139,7 @@ class CameraUnitsTest(unittest.TestCase):
         self.assertAlmostEqual(computed_gsd, expected_gsd, places=3)
 
         # Case 3: asymmetric aspect ratio
-        camera_ = deepcopy(TEST_CAMERA)
-        camera_.fx = 5 * camera_.fy // 4
+        camera_ = replace(TEST_CAMERA, fx=5 * TEST_CAMERA.fy // 4)
         expected_gsd = 0.171
         computed_gsd = camera_utils.compute_ground_sampling_distance(camera_, height)
         self.assertAlmostEqual(computed_gsd, expected_gsd, places=3)
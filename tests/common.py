@@ -1,4 +1,4 @@
-from src.data_model import Camera
+from src.data_model import Camera, DatasetSpec
 
 fx = 700
 fy = 700
@@ -19,3 +19,8 @@ TEST_CAMERA = Camera(
     image_size_x_px,
     image_size_y_px
 )
+
+
+#Skydio VT300L - Wide camera with the nominal dataset spec used in main.ipynb
+TEST_CAMERA_X10 = Camera(4938.56, 4936.49, 4095.5, 3071.5, 13.107, 9.830, 8192, 6144)
+TEST_DATASET_SPEC = DatasetSpec(0.7, 0.7, 30.48, 150, 150, 2)
@@ -0,0 +1,151 @@
+import unittest
+from unittest import mock
+from dataclasses import replace
+
+import numpy as np
+
+from src.data_model import FlightPlan
+from tests.common import TEST_CAMERA_X10, TEST_DATASET_SPEC
+import src.plan_computation as plan_computation
+
+
+class PlanComputationTest(unittest.TestCase):
+
+    def test_generate_photo_plan_on_grid(self) -> None:
+
+        # Case 1: baseline, 14 x 10 grid in a lawn-mower pattern
+        plan = plan_computation.generate_photo_plan_on_grid(TEST_CAMERA_X10, TEST_DATASET_SPEC)
+        self.assertEqual(len(plan), 140)
+        self.assertAlmostEqual(plan[0].x, 6.7444, places=3)
+        self.assertAlmostEqual(plan[0].y, 1.0254, places=3)
+        self.assertAlmostEqual(plan[9].x, 143.2556, places=3)
+        self.assertAlmostEqual(plan[10].x, plan[9].x) #second row starts where the first row ended
+        self.assertAlmostEqual(plan[10].y, 12.4061, places=3)
+        self.assertAlmostEqual(plan[-1].x, 6.7444, places=3)
+        self.assertAlmostEqual(plan[-1].y, 148.9746, places=3)
+        self.assertAlmostEqual(plan[0].z, TEST_DATASET_SPEC.height, places=4)
+        self.assertAlmostEqual(plan[0].speed_mps, 3.0859, places=3)
+        self.assertTrue(plan[0].photo_trigger)
+        self.assertEqual(plan.xs.dtype, np.float32)
+
+        # Case 2: scan narrower than a single image, one centered column
+        plan = plan_computation.generate_photo_plan_on_grid(TEST_CAMERA_X10, replace(TEST_DATASET_SPEC, scan_dimension_x=10))
+        self.assertEqual(len(plan), 14)
+        self.assertAlmostEqual(plan[0].x, 5.0)
+        self.assertAlmostEqual(plan[1].x, 5.0)
+        self.assertAlmostEqual(plan[1].y, 12.4061, places=3)
+
+        # Case 3: full overlap leaves no spacing between images
+        with self.assertRaises(ValueError):
+            plan_computation.generate_photo_plan_on_grid(TEST_CAMERA_X10, replace(TEST_DATASET_SPEC, overlap=1.0))
+
+    def test_flight_plan_from_waypoints(self) -> None:
+
+        # Round trip through the list-of-waypoints form
+        plan = plan_computation.generate_photo_plan_on_grid(TEST_CAMERA_X10, TEST_DATASET_SPEC)
+        rebuilt_plan = FlightPlan.from_waypoints(plan[:])
+        self.assertEqual(len(rebuilt_plan), len(plan))
+        np.testing.assert_array_equal(rebuilt_plan.xs, plan.xs)
+        np.testing.assert_array_equal(rebuilt_plan.ys, plan.ys)
+        np.testing.assert_array_equal(rebuilt_plan.speeds_mps, plan.speeds_mps)
+        np.testing.assert_array_equal(rebuilt_plan.triggers, plan.triggers)
+
+    def test_flight_plan_equality(self) -> None:
+
+        # Plans compare by value, like lists of waypoints
+        plan = plan_computation.generate_photo_plan_on_grid(TEST_CAMERA_X10, TEST_DATASET_SPEC)
+        other_plan = plan_computation.generate_photo_plan_on_grid(TEST_CAMERA_X10, TEST_DATASET_SPEC)
+        self.assertTrue(plan == other_plan)
+
+        # Any differing waypoint makes them unequal
+        other_plan.triggers[0] = False
+        self.assertFalse(plan == other_plan)
+        self.assertFalse(plan == plan[:])
+
+    def test_waypoint_times(self) -> None:
+
+        plan = plan_computation.generate_photo_plan_on_grid(TEST_CAMERA_X10, TEST_DATASET_SPEC)
+        times = plan_computation.waypoint_times(plan, 3.5, 16)
+        self.assertEqual(len(times), len(plan))
+        self.assertEqual(times.dtype, np.float64)
+        self.assertAlmostEqual(times[0], 0.0)
+        self.assertAlmostEqual(times[1], 2.7582, places=3)
+        self.assertAlmostEqual(times[3], 8.2745, places=3)
+        self.assertAlmostEqual(times[-1], 376.7914, places=2)
+
+        # Legacy list of waypoints gives the same times
+        np.testing.assert_allclose(plan_computation.waypoint_times(plan[:], 3.5, 16), times)
+
+    def test_waypoint_times_numpy_path(self) -> None:
+
+        # The compiled loop and the NumPy path agree
+        plan = plan_computation.generate_photo_plan_on_grid(TEST_CAMERA_X10, TEST_DATASET_SPEC)
+        expected_times = plan_computation.waypoint_times(plan, 3.5, 7)
+        with mock.patch.object(plan_computation, "_HAS_NUMBA", False):
+            computed_times = plan_computation.waypoint_times(plan, 3.5, 7)
+        np.testing.assert_allclose(computed_times, expected_times, rtol=1e-5)
+
+    def test_waypoint_times_short_plans(self) -> None:
+
+        # Empty and single-point plans have no segments, on both paths
+        plan = plan_computation.generate_photo_plan_on_grid(TEST_CAMERA_X10, TEST_DATASET_SPEC)
+        for num_points in [0, 1]:
+            short_plan = FlightPlan(plan.points[:num_points].copy(), plan.speeds_mps[:num_points], plan.triggers[:num_points])
+            for has_numba in [True, False]:
+                with mock.patch.object(plan_computation, "_HAS_NUMBA", has_numba):
+                    times = plan_computation.waypoint_times(short_plan, 3.5, 16)
+                np.testing.assert_array_equal(times, [0.0])
+
+    def test_apply_trapezoidal_prof_batched(self) -> None:
+
+        # Batched segment times match the scalar profile for both shapes
+        dists = np.array([100.0, 4.0, 0.0])
+        expected_times = [plan_computation.apply_trapezoidal_prof(dist, 2, 1, 5)[0] for dist in dists]
+        computed_times = plan_computation.apply_trapezoidal_prof_batched(dists, 2, 1, 5)
+        np.testing.assert_allclose(computed_times, expected_times)
+
+        # Array input to the scalar function dispatches to the batched path
+        computed_times = plan_computation.apply_trapezoidal_prof(dists, 2, 1, 5)
+        np.testing.assert_allclose(computed_times, expected_times)
+
+    def test_make_trapezoidal(self) -> None:
+
+        # Precomputed profile gives the same segment times as the scalar profile
+        profile = plan_computation.make_trapezoidal(2, 1, 5)
+        self.assertAlmostEqual(profile.d_thresh, 12.0)
+        for dist in [100.0, 12.0, 4.0, 0.0]:
+            self.assertAlmostEqual(float(profile.segment_time(dist)), plan_computation.apply_trapezoidal_prof(dist, 2, 1, 5)[0])
+
+    def test_waypoint_times_varying_speeds(self) -> None:
+
+        # Per-segment speeds take the non-uniform paths, which agree with the scalar profile
+        plan = plan_computation.generate_photo_plan_on_grid(TEST_CAMERA_X10, TEST_DATASET_SPEC)
+        speeds = np.linspace(1.0, 4.0, len(plan), dtype=np.float32)
+        varied_plan = FlightPlan(plan.points, speeds, plan.triggers)
+        dists = np.hypot(np.diff(plan.xs.astype(np.float64)), np.diff(plan.ys.astype(np.float64)))
+        expected_times = np.concatenate(([0.0], np.cumsum([plan_computation.apply_trapezoidal_prof(float(dist), 3.5, float(v_blur), 7)[0] for dist, v_blur in zip(dists, speeds[:-1])])))
+        for has_numba in [True, False]:
+            with mock.patch.object(plan_computation, "_HAS_NUMBA", has_numba):
+                np.testing.assert_allclose(plan_computation.waypoint_times(varied_plan, 3.5, 7), expected_times, rtol=1e-5)
+
+        # Array-valued profiles hash by identity instead of raising on the array fields
+        profile = plan_computation.make_trapezoidal(3.5, speeds, 7)
+        self.assertIsInstance(hash(profile), int)
+
+    def test_apply_trapezoidal_prof(self) -> None:
+
+        # Case 1: long segment reaches v_max (trapezoid)
+        t_total, times, vels, shape = plan_computation.apply_trapezoidal_prof(100, 2, 1, 5)
+        self.assertEqual(shape, "Trapezoid")
+        self.assertAlmostEqual(t_total, 2 * 2 + (100 - 12) / 5)
+        self.assertEqual(vels, [1, 5, 5, 1])
+
+        # Case 2: short segment never reaches v_max (triangle)
+        t_total, times, vels, shape = plan_computation.apply_trapezoidal_prof(4, 2, 1, 5)
+        self.assertEqual(shape, "Triangle")
+        self.assertAlmostEqual(vels[1], 3.0)
+        self.assertAlmostEqual(t_total, 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()